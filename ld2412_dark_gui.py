@@ -2,13 +2,17 @@
 # -*- coding: utf-8 -*-
 
 import tkinter as tk
-from tkinter import ttk, scrolledtext, messagebox
+from tkinter import ttk, scrolledtext, messagebox, filedialog
 import threading
 import time
 import queue
+import re
+import struct
 from datetime import datetime
-from collections import deque
+from functools import lru_cache
+import fnmatch
 import os
+import traceback
 
 # 明確導入 serial 模組以避免命名衝突
 try:
@@ -20,11 +24,17 @@ except ImportError as e:
     print("請安裝 pyserial: pip install pyserial")
     serial = None
 
+# 串列埠列舉工具 - 可選導入，不可用時改為掃描 /dev
+try:
+    from serial.tools import list_ports
+except ImportError:
+    list_ports = None
+
 # 圖表相關套件 - 可選導入
 try:
     import matplotlib.pyplot as plt
     import matplotlib.animation as animation
-    from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
+    from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg, NavigationToolbar2Tk
     from matplotlib.figure import Figure
     import numpy as np
     
@@ -59,6 +69,134 @@ except ImportError as e:
 # 消除macOS上的tkinter警告
 os.environ['TK_SILENCE_DEPRECATION'] = '1'
 
+# 幀頭/幀尾定界符 (官方LD2412庫定義)
+_DATA_HEADER = b'\xF4\xF3\xF2\xF1'
+_DATA_TAIL = b'\xF8\xF7\xF6\xF5'
+_CMD_HEADER = b'\xFD\xFC\xFB\xFA'
+_CMD_TAIL = b'\x04\x03\x02\x01'
+
+# 完整幀匹配：數據幀 16-84 字節、命令回應幀 12-64 字節 (幀頭與幀尾之間允許任意位元組)
+_FRAME_RE = re.compile(
+    re.escape(_DATA_HEADER) + b'.{8,76}?' + re.escape(_DATA_TAIL) + b'|' +
+    re.escape(_CMD_HEADER) + b'.{4,56}?' + re.escape(_CMD_TAIL),
+    re.DOTALL)
+_HEADER_RE = re.compile(re.escape(_DATA_HEADER) + b'|' + re.escape(_CMD_HEADER))
+
+@lru_cache(maxsize=64)
+def _parse_command(hex_string):
+    """解析十六進位命令字串 - 組合命令序列重複發送相同命令，只需解析一次"""
+    return bytes.fromhex(hex_string)  # fromhex 本身會略過空白字元
+
+# 查詢參數命令 (CMD_QUERY) - 快速啟動時觸發模組回應，模組載入時即解析為位元組
+_CMD_QUERY = "FD FC FB FA 02 00 12 00 04 03 02 01"
+_CMD_QUERY_BYTES = bytes.fromhex(_CMD_QUERY)
+
+# 解析線程隊列標記：要求清空接收緩衝區
+_RESET_BUFFER = object()
+
+# 界面隊列滿時可丟棄的消息類型，其餘控制消息 ('response'/'error'/'disconnect'/'reset') 必須送達
+_DROPPABLE_MESSAGES = frozenset(('data', 'frames'))
+
+# 數據幀第4-14字節的固定欄位 (小端序)
+_FRAME_FIELDS = struct.Struct('<HBBBHBHB')
+
+# 目標狀態統計增量表 (移動, 靜止, 無目標)，以狀態值查表取代逐幀分支判斷
+# 0x00=無目標, 0x01=運動, 0x02=靜止, 0x03=運動&靜止, 0x04-0x07 底噪檢測/未知不計入
+_STATE_INC = (
+    (0, 0, 1),
+    (1, 0, 0),
+    (0, 1, 0),
+    (1, 1, 0),
+    (0, 0, 0),
+    (0, 0, 0),
+    (0, 0, 0),
+    (0, 0, 0),
+)
+
+# 目標狀態文字查表 (根據協議文檔的目標狀態值)，涵蓋單字節全部256個值
+_STATE_TEXT = (
+    "❌ 無目標",
+    "🏃 運動目標",
+    "🧍 靜止目標",
+    "🏃🧍 運動&靜止目標",
+    "🔍 正在底噪檢測中",
+    "✅ 底噪檢測成功",
+    "❌ 底噪檢測失敗",
+) + tuple(f"❓ 未知狀態(0x{state:02X})" for state in range(7, 256))
+
+# 即時數據面板在尚未收到數據時顯示的固定內容
+_REALTIME_WAITING_TEXT = """╔══════════════════════════════════════════════════╗
+║                   即時數據分析                     ║
+╠══════════════════════════════════════════════════╣
+║ 工作模式: 等待數據...                            ║
+║ 目標狀態: 等待數據...                            ║
+║ 移動距離:   -- cm    移動能量:  --              ║
+║ 靜止距離:   -- cm    靜止能量:  --              ║
+║ 檢測距離:   -- cm    光感值:   --              ║
+║                                                  ║
+║ 請先連接設備並開始監控                           ║
+╚══════════════════════════════════════════════════╝"""
+
+# 詳細解析分頁的數據幀報告模板（預先建立，每幀只做一次 str.format）
+_ENGINEERING_FRAME_TMPL = (
+    "[{ts}] 📡 工程模式數據幀 #{frame_no}\n"
+    "幀結構: 長度={frame_len}字節, 數據類型=0x{data_type:02X}, 校驗=0x{head_byte:02X}\n"
+    "目標狀態: {state_text} (0x{state:02X})\n"
+    "基本數據: 移動距離={move_dist:4d}cm/能量={move_energy:3d}, 靜止距離={still_dist:4d}cm/能量={still_energy:3d}\n"
+    "光感數據: {light:3d} (0x{light:02X}) - 範圍0-255，值越大表示光線越強\n"
+    "檢測距離: {detect_dist:4d}cm (綜合距離)\n"
+    "{gate_info}\n"
+    "門能量分布:{moving_info}{still_info}\n"
+    + "=" * 60 + "\n"
+)
+
+_NORMAL_FRAME_TMPL = (
+    "[{ts}] 📊 一般模式數據幀 #{frame_no}\n"
+    "幀結構: 長度={frame_len}字節, 數據類型=0x{data_type:02X}, 校驗=0x{head_byte:02X}\n"
+    "目標狀態: {state_text} (0x{state:02X})\n"
+    "基本數據: 移動距離={move_dist:4d}cm/能量={move_energy:3d}, 靜止距離={still_dist:4d}cm/能量={still_energy:3d}\n"
+    "檢測距離: {detect_dist:4d}cm\n"
+    "光感數據: {light:3d} (工程模式下可用)\n"
+    "💡 提示: 開啟工程模式可查看詳細門能量分布\n"
+    + "=" * 60 + "\n"
+)
+
+class RingBuffer:
+    """固定容量環形緩衝區 - 多個欄位共用同一寫入位置 (每欄一個預先配置的列表)，寫滿後直接覆寫最舊的數據"""
+    
+    def __init__(self, capacity, fields):
+        self.capacity = capacity
+        self.fields = fields
+        self.columns = {name: [0] * capacity for name in fields}
+        self.column_list = tuple(self.columns[name] for name in fields)  # 與 fields 同序，供 append 使用
+        self.head = 0  # 下一個寫入位置
+        self.count = 0
+    
+    def append(self, *values):
+        """寫入一筆記錄，values 依 fields 的順序排列"""
+        head = self.head
+        for column, value in zip(self.column_list, values):
+            column[head] = value
+        self.head = (head + 1) % self.capacity
+        if self.count < self.capacity:
+            self.count += 1
+    
+    def clear(self):
+        self.head = 0
+        self.count = 0
+    
+    def latest(self, field, n):
+        """按時間順序取出指定欄位最近n筆數據"""
+        items = self.columns[field]
+        n = min(n, self.count)
+        start = self.head - n
+        if start >= 0:
+            return items[start:self.head]
+        return items[start:] + items[:self.head]
+    
+    def __len__(self):
+        return self.count
+
 class DarkLD2412GUI:
     def __init__(self):
         self.root = tk.Tk()
@@ -99,24 +237,47 @@ class DarkLD2412GUI:
         self.command_timeout = 1.0  # 命令超時時間
         
         # 數據處理
-        self.data_queue = queue.Queue()
-        self.raw_buffer = bytearray()
+        self.stop_event = threading.Event()  # 程式結束時通知讀取線程退出
+        self.reader_wakeup = threading.Event()  # 開始監控時喚醒閒置中的讀取線程
+        self.raw_queue = queue.SimpleQueue()   # 讀取線程 → 解析線程：原始位元組
+        self.data_queue = queue.SimpleQueue()  # 解析線程 → 界面線程：格式化行/解碼結果
+        self.max_queue_size = 256  # 隊列軟上限，超過時丟棄最舊的數據消息
+        self.queue_lock = threading.Lock()  # 保護隊列重建，避免與取出消息交錯而打亂順序
+        self.raw_buffer = bytearray(8192)  # 預先配置的接收環形緩衝區
+        self.raw_start = 0  # 讀取位置 (尚未解析數據的起點)
+        self.raw_end = 0    # 寫入位置
         
         # 新增：定時分析機制
         self.last_analysis_time = 0
         self.analysis_interval = 0.1  # 每0.1秒分析一次
         
-        # 數據歷史
-        self.data_history = {
-            'time': deque(maxlen=100),
-            'moving_distance': deque(maxlen=100),
-            'moving_energy': deque(maxlen=100),
-            'still_distance': deque(maxlen=100),
-            'still_energy': deque(maxlen=100),
-            'detection_distance': deque(maxlen=100),
-            'target_state': deque(maxlen=100),
-            'light_value': deque(maxlen=100)
-        }
+        # 統計/圖表刷新節流：僅在有新數據幀時，每N次更新週期刷新一次
+        self.display_dirty = True
+        self.chart_dirty = True  # 圖表分頁不可見時保留，切換回來後再刷新
+        self.display_tick = 0
+        self.stats_refresh_ticks = 10
+        self.detail_visible = True  # 詳細解析分頁是否可見，每次更新週期檢查一次
+        
+        # 時間戳快取：秒級部分只在秒數變化時重新格式化
+        self.last_ts = (0, "")
+        
+        # 已顯示的標籤/文本內容快取，內容未變化時跳過 Tk 重繪
+        self.last_widget_text = {}
+        self.realtime_shown_data = False  # 即時數據面板最後顯示的數據幀 (False=尚未顯示)
+        self.awaiting_reset = False  # 斷開後等待解析線程確認清空緩衝區，期間丟棄舊連接的數據
+        
+        # 圖表狀態 - 預先初始化，避免每次更新時 hasattr 檢查
+        self.chart_frozen = False
+        self.use_matplotlib = False  # matplotlib 圖表建立完成後設為 True
+        
+        # 待插入的文本行，每次更新週期一次性插入，減少 Tk 插入/捲動次數
+        self.raw_pending = []
+        self.detailed_pending = []
+        
+        # 數據歷史 - 各欄位共用同一個環形緩衝區的寫入位置，每幀只需一次寫入
+        self.data_history = RingBuffer(100, (
+            'time', 'moving_distance', 'moving_energy', 'still_distance',
+            'still_energy', 'detection_distance', 'target_state', 'light_value'))
         
         # 統計數據
         self.stats = {
@@ -124,7 +285,7 @@ class DarkLD2412GUI:
             'moving_detections': 0,
             'still_detections': 0,
             'no_target': 0,
-            'start_time': time.time(),
+            'start_time': time.monotonic(),
             'max_distance': 0,
             'min_distance': 9999,
             'last_update': time.time()
@@ -212,6 +373,7 @@ class DarkLD2412GUI:
         # 3. 分頁控件
         self.notebook = ttk.Notebook(main_frame)
         self.notebook.pack(fill=tk.BOTH, expand=True, pady=(10, 0))
+        self.notebook.bind('<<NotebookTabChanged>>', self.on_tab_changed)
         
         # 創建各個分頁
         self.create_realtime_tab()
@@ -313,10 +475,10 @@ class DarkLD2412GUI:
             ("🗑️ 清除數據", None)
         ]
         
-        # 創建按鈕網格 - 改為5列布局，更緊湊
+        # 創建按鈕網格 - 改為5列布局，更緊湊（命令位元組在建立按鈕時預先解析）
         for i, (name, cmd) in enumerate(commands):
             if cmd:
-                btn = ttk.Button(cmd_frame, text=name, command=lambda c=cmd: self.send_command(c), width=20)
+                btn = ttk.Button(cmd_frame, text=name, command=lambda h=cmd, c=bytes.fromhex(cmd): self.send_command(h, c), width=20)
             else:
                 btn = ttk.Button(cmd_frame, text=name, command=self.clear_data, width=20)
             btn.grid(row=i//5, column=i%5, padx=2, pady=2, sticky=(tk.W, tk.E))
@@ -386,6 +548,7 @@ class DarkLD2412GUI:
         """創建門能量分布圖分頁 - 根據matplotlib可用性選擇實現"""
         chart_tab = ttk.Frame(self.notebook)
         self.notebook.add(chart_tab, text="📊 門能量圖")
+        self.chart_tab = chart_tab
         
         if MATPLOTLIB_AVAILABLE:
             self.create_matplotlib_chart_tab(chart_tab)
@@ -437,6 +600,7 @@ class DarkLD2412GUI:
         self.moving_chart_text = tk.Text(chart_container, font=("Courier", 8))
         self.still_chart_text = tk.Text(chart_container, font=("Courier", 8))
         self.chart_text = self.moving_chart_text  # 兼容性
+        self.trend_canvas = None
     
     def create_text_chart_tab(self, parent):
         """創建文字版圖表分頁（matplotlib不可用時的備選方案）"""
@@ -451,6 +615,16 @@ class DarkLD2412GUI:
         info_label = ttk.Label(info_frame, text="💡 如需專業圖表功能，請執行: pip install matplotlib numpy")
         info_label.pack(side=tk.LEFT, padx=5)
         
+        # 距離趨勢圖（底部）- 使用 Canvas 重用長條項目，只更新座標不重繪文字
+        trend_frame = ttk.LabelFrame(main_container, text="📈 距離趨勢 (正常模式)", padding="5")
+        trend_frame.pack(side=tk.BOTTOM, fill=tk.X, pady=(10, 0))
+        
+        self.trend_canvas = tk.Canvas(trend_frame, height=160, bg=self.colors['bg_medium'],
+                                      highlightthickness=0)
+        self.trend_canvas.pack(fill=tk.X, expand=True)
+        self.trend_bars = []
+        self.trend_label = None
+        
         # 移動目標能量圖（左側）
         moving_frame = ttk.LabelFrame(main_container, text="🏃 移動目標能量分布", padding="5")
         moving_frame.pack(side=tk.LEFT, fill=tk.BOTH, expand=True, padx=(0, 5))
@@ -493,7 +667,7 @@ class DarkLD2412GUI:
         ]
         
         for i, (name, cmd) in enumerate(resolution_commands):
-            btn = ttk.Button(resolution_frame, text=name, command=lambda c=cmd: self.send_command(c), width=25)
+            btn = ttk.Button(resolution_frame, text=name, command=lambda h=cmd, c=bytes.fromhex(cmd): self.send_command(h, c), width=25)
             btn.grid(row=i//4, column=i%4, padx=5, pady=5, sticky=(tk.W, tk.E))
         
         for i in range(4):
@@ -511,7 +685,7 @@ class DarkLD2412GUI:
         ]
         
         for i, (name, cmd) in enumerate(baud_commands):
-            btn = ttk.Button(baud_frame, text=name, command=lambda c=cmd: self.send_command(c), width=25)
+            btn = ttk.Button(baud_frame, text=name, command=lambda h=cmd, c=bytes.fromhex(cmd): self.send_command(h, c), width=25)
             btn.grid(row=i//4, column=i%4, padx=5, pady=5, sticky=(tk.W, tk.E))
         
         for i in range(4):
@@ -529,7 +703,7 @@ class DarkLD2412GUI:
         ]
         
         for i, (name, cmd) in enumerate(network_commands):
-            btn = ttk.Button(network_frame, text=name, command=lambda c=cmd: self.send_command(c), width=25)
+            btn = ttk.Button(network_frame, text=name, command=lambda h=cmd, c=bytes.fromhex(cmd): self.send_command(h, c), width=25)
             btn.grid(row=i//4, column=i%4, padx=5, pady=5, sticky=(tk.W, tk.E))
         
         for i in range(4):
@@ -547,7 +721,7 @@ class DarkLD2412GUI:
         ]
         
         for i, (name, cmd) in enumerate(advanced_commands):
-            btn = ttk.Button(advanced_frame, text=name, command=lambda c=cmd: self.send_command(c), width=25)
+            btn = ttk.Button(advanced_frame, text=name, command=lambda h=cmd, c=bytes.fromhex(cmd): self.send_command(h, c), width=25)
             btn.grid(row=i//4, column=i%4, padx=5, pady=5, sticky=(tk.W, tk.E))
         
         for i in range(4):
@@ -565,7 +739,7 @@ class DarkLD2412GUI:
         ]
         
         for i, (name, cmd) in enumerate(light_commands):
-            btn = ttk.Button(light_quick_frame, text=name, command=lambda c=cmd: self.send_command(c), width=25)
+            btn = ttk.Button(light_quick_frame, text=name, command=lambda h=cmd, c=bytes.fromhex(cmd): self.send_command(h, c), width=25)
             btn.grid(row=i//4, column=i%4, padx=5, pady=5, sticky=(tk.W, tk.E))
         
         for i in range(4):
@@ -666,12 +840,12 @@ class DarkLD2412GUI:
         self.canvas.get_tk_widget().pack(fill=tk.BOTH, expand=True)
         
         # 添加工具欄
-        from matplotlib.backends.backend_tkagg import NavigationToolbar2Tk
         toolbar = NavigationToolbar2Tk(self.canvas, chart_frame)
         toolbar.update()
         
         # 調整布局，給雷達圖留出更多空間，特別是右側空間給圖例
         self.fig.tight_layout(pad=4.0, w_pad=3.0, h_pad=3.5, rect=[0.02, 0.02, 0.85, 0.96])  # 右側留15%空間給雷達圖圖例
+        self.use_matplotlib = True
     
     def setup_gate_energy_charts(self):
         """設置門能量柱狀圖"""
@@ -717,6 +891,7 @@ class DarkLD2412GUI:
         self.still_sensitivity_markers = []
         self.moving_sensitivity_texts = []
         self.still_sensitivity_texts = []
+        self.sensitivity_marker_key = None
     
     def setup_distance_trend_chart(self):
         """設置距離趨勢圖"""
@@ -778,6 +953,11 @@ class DarkLD2412GUI:
         self.radar_moving, = self.ax4.plot([], [], 'o-', linewidth=2, color='#4a9eff', alpha=0.8, label=moving_label, markersize=4)
         self.radar_still, = self.ax4.plot([], [], 'o-', linewidth=2, color='#ef4444', alpha=0.8, label=still_label, markersize=4)
         
+        # 填充區域也只建立一次，之後以set_xy更新頂點
+        zeros = [0] * len(self.radar_angles)
+        self.radar_moving_fill, = self.ax4.fill(self.radar_angles, zeros, alpha=0.25, color='#4a9eff')
+        self.radar_still_fill, = self.ax4.fill(self.radar_angles, zeros, alpha=0.25, color='#ef4444')
+        
         # 設置雷達圖格式
         self.ax4.set_theta_offset(np.pi / 2)
         self.ax4.set_theta_direction(-1)
@@ -799,9 +979,15 @@ class DarkLD2412GUI:
         chart_type = self.chart_type_var.get()
         self.log(f"📊 切換圖表類型: {chart_type}")
         # 重新繪製圖表
-        if hasattr(self, 'current_data') and self.current_data:
+        if self.current_data:
             self.update_matplotlib_charts()
     
+    def on_tab_changed(self, event=None):
+        """分頁切換事件 - 隱藏期間跳過的統計與圖表在下次更新時刷新"""
+        self.display_dirty = True
+        self.chart_dirty = True
+        self.realtime_shown_data = False
+    
     def toggle_chart_freeze(self):
         """切換圖表凍結狀態"""
         self.chart_frozen = not self.chart_frozen
@@ -815,7 +1001,6 @@ class DarkLD2412GUI:
     def save_chart(self):
         """保存圖表"""
         try:
-            from tkinter import filedialog
             timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
             filename = filedialog.asksaveasfilename(
                 defaultextension=".png",
@@ -859,76 +1044,138 @@ class DarkLD2412GUI:
         self.detailed_text.pack(fill=tk.BOTH, expand=True)
     
     def start_data_thread(self):
-        """啟動數據讀取線程"""
+        """啟動數據讀取線程與解析線程"""
         self.data_thread = threading.Thread(target=self.data_reader, daemon=True)
         self.data_thread.start()
+        self.parser_thread = threading.Thread(target=self.data_parser, daemon=True)
+        self.parser_thread.start()
     
     def data_reader(self):
-        """數據讀取線程 - 高速版本"""
+        """數據讀取線程 - 阻塞式讀取，有數據時立即喚醒，閒置時不佔用CPU"""
         consecutive_errors = 0
-        max_read_size = 512  # 進一步增加讀取緩衝區大小
+        max_read_size = 4096  # 單次讀取上限，實際在位元組間隔逾時後即返回
+        failed_port = None  # 已要求斷開的串列埠，等待界面線程關閉前不再讀取
         
-        while True:
-            if self.is_connected and self.serial_port and self.is_monitoring:
+        while not self.stop_event.is_set():
+            port = self.serial_port
+            if self.is_connected and port and self.is_monitoring and port is not failed_port:
                 try:
-                    # 檢查是否有數據可讀
-                    if self.serial_port.in_waiting > 0:
-                        # 限制每次讀取的數據量
-                        bytes_to_read = min(self.serial_port.in_waiting, max_read_size)
-                        data = self.serial_port.read(bytes_to_read)
-                        
-                        if data:
-                            self.data_queue.put(('data', data))
-                            consecutive_errors = 0  # 重置錯誤計數
-                        
-                        # 如果有命令等待回應，優先處理
-                        if self.waiting_for_response:
-                            time.sleep(0.001)  # 極小延遲
-                        elif bytes_to_read >= max_read_size:
-                            time.sleep(0.005)  # 減少延遲
+                    # 阻塞直到收到數據 (timeout) 或一段數據結束 (inter_byte_timeout)
+                    data = port.read(max_read_size)
                     
-                    # 正常延遲 - 配置模式下更快響應
-                    if self.waiting_for_response or self.is_config_mode:
-                        time.sleep(0.001)  # 配置模式或等待回應時極快
-                    else:
-                        time.sleep(0.005)  # 正常情況下適中
+                    if data:
+                        # 交給解析線程處理，讀取線程立即回到 read
+                        self.raw_queue.put(data)
+                        consecutive_errors = 0  # 重置錯誤計數
                     
                 except SerialException as e:
                     consecutive_errors += 1
-                    self.data_queue.put(('error', f"串列埠錯誤: {e}"))
+                    self.post_message(('error', f"串列埠錯誤: {e}"))
                     
                     # 如果連續錯誤過多，停止監控
                     if consecutive_errors > 10:
-                        self.data_queue.put(('disconnect', "連續錯誤過多，自動斷開連接"))
-                        break
+                        self.post_message(('disconnect', "連續錯誤過多，自動斷開連接"))
+                        failed_port = port
+                        consecutive_errors = 0
+                        continue
                     
                     time.sleep(0.02)
                     
                 except Exception as e:
                     consecutive_errors += 1
-                    self.data_queue.put(('error', f"未知錯誤: {e}"))
+                    self.post_message(('error', f"未知錯誤: {e}"))
                     
                     if consecutive_errors > 5:
-                        self.data_queue.put(('disconnect', "嚴重錯誤，自動斷開連接"))
-                        break
+                        self.post_message(('disconnect', "嚴重錯誤，自動斷開連接"))
+                        failed_port = port
+                        consecutive_errors = 0
+                        continue
                     
                     time.sleep(0.05)
             else:
-                time.sleep(0.02)  # 未連接時減少延遲
+                # 未監控時等待喚醒，不再定時輪詢
+                self.reader_wakeup.wait(1.0)
+                self.reader_wakeup.clear()
+    
+    def data_parser(self):
+        """數據解析線程 - 解析幀並預先格式化原始數據行，界面線程只負責插入顯示"""
+        while True:
+            data = self.raw_queue.get()
+            if data is None:  # 程式結束
+                break
+            if data is _RESET_BUFFER:  # 界面線程要求清空緩衝區
+                self.reset_raw_buffer()
+                self.post_message(('reset', None))  # 此標記之前的消息都屬於舊連接
+                continue
+            self.post_message(('data', self.format_raw_data(data, self.get_timestamp())))
+            self.parse_received_bytes(data)
+    
+    def post_message(self, message):
+        """從讀取/解析線程送出消息到界面線程 - 界面停頓時丟棄最舊的數據消息，避免隊列無限增長
+        
+        控制消息不會被丟棄：隊列已滿時取出全部消息，移除最舊的一條數據消息後依原順序放回
+        """
+        data_queue = self.data_queue
+        with self.queue_lock:
+            if data_queue.qsize() >= self.max_queue_size:
+                pending = []
+                try:
+                    while True:
+                        pending.append(data_queue.get_nowait())
+                except queue.Empty:
+                    pass
+                for i, (msg_type, _) in enumerate(pending):
+                    if msg_type in _DROPPABLE_MESSAGES:
+                        del pending[i]
+                        break
+                for pending_message in pending:
+                    data_queue.put(pending_message)
+            data_queue.put(message)
+    
+    def cancel_serial_read(self):
+        """中斷讀取線程中阻塞的 read 呼叫 (pyserial 3.4+ 支援 cancel_read)"""
+        port = self.serial_port
+        if port is None:
+            return
+        try:
+            port.cancel_read()
+        except Exception:
+            pass
     
     def update_display(self):
         """更新顯示 - 高速版本"""
         processed_count = 0
-        max_process_per_cycle = 15  # 進一步增加每次處理的消息數量
+        max_process_per_cycle = 200  # 一次取出隊列中累積的消息，避免逐條刷新界面
+        timestamp = self.get_timestamp()
+        
+        # 視窗最小化或分頁未顯示時，跳過看不到的文本格式化與插入
+        visible = self.root.state() != 'iconic'
+        raw_visible = visible and self.raw_text.winfo_viewable()
+        self.detail_visible = visible and self.detailed_text.winfo_viewable()
         
         # 處理數據隊列
-        while not self.data_queue.empty() and processed_count < max_process_per_cycle:
+        while processed_count < max_process_per_cycle:
             try:
-                msg_type, data = self.data_queue.get_nowait()
+                with self.queue_lock:
+                    msg_type, data = self.data_queue.get_nowait()
                 processed_count += 1
                 
-                if msg_type == 'data':
-                    self.process_data(data)
+                if msg_type == 'reset':
+                    self.awaiting_reset = False  # 之後的消息屬於新連接
+                elif self.awaiting_reset and msg_type in ('data', 'frames', 'response'):
+                    pass  # 斷開前舊連接的數據，直接丟棄
+                elif msg_type == 'data':
+                    if raw_visible:
+                        self.raw_pending.append(data)  # 解析線程已格式化
+                elif msg_type == 'frames':
+                    for record in data:
+                        try:
+                            self.apply_periodic_data(record, timestamp)
+                        except Exception as e:
+                            # 單一數據幀出錯不影響同批其他數據幀
+                            self.log(f"❌ 顯示更新錯誤: {e}")
+                elif msg_type == 'response':
+                    self.parse_command_response(data, timestamp)
                 elif msg_type == 'error':
                     self.log(f"❌ 錯誤: {data}")
                 elif msg_type == 'disconnect':
@@ -941,16 +1188,27 @@ class DarkLD2412GUI:
                 self.log(f"❌ 顯示更新錯誤: {e}")
                 break
         
+        # 原始數據與詳細解析每次更新最多各插入一次
+        self.flush_pending_text()
+        
         # 檢查命令超時
         if self.waiting_for_response:
-            if time.time() - self.last_command_time > self.command_timeout:
+            if time.monotonic() - self.last_command_time > self.command_timeout:
                 self.waiting_for_response = False
         
-        # 更新顯示內容
+        # 更新顯示內容 - 即時數據每次更新，統計和圖表僅在有新數據時節流刷新
+        self.display_tick += 1
         try:
-            self.update_realtime_display()
-            self.update_stats_display()
-            self.update_chart_display()
+            if visible:
+                self.update_realtime_display()
+                if self.display_tick % self.stats_refresh_ticks == 0:
+                    if self.display_dirty:
+                        self.display_dirty = False
+                        self.update_stats_display()
+                    # 圖表不可見時保留 chart_dirty，切換到圖表分頁後再刷新
+                    if self.chart_dirty and self.chart_tab.winfo_viewable():
+                        self.chart_dirty = False
+                        self.update_chart_display()
         except Exception as e:
             self.log(f"❌ 界面更新錯誤: {e}")
         
@@ -961,179 +1219,156 @@ class DarkLD2412GUI:
             update_interval = 80  # 正常模式
         self.root.after(update_interval, self.update_display)
     
-    def process_data(self, data):
-        """處理接收到的數據 - 優化版本：命令回應立即分析，數據幀定時分析"""
-        # 限制緩衝區大小
-        if len(self.raw_buffer) > 3000:
-            self.raw_buffer = self.raw_buffer[-1500:]  # 保留最近的數據
-        
-        self.raw_buffer.extend(data)
-        
+    def format_raw_data(self, data, timestamp):
+        """格式化接收到的原始數據為顯示行 - 在解析線程執行"""
         # 顯示原始數據（限制長度）
         if len(data) <= 256:  # 只顯示較小的數據包
-            hex_str = ' '.join([f'{b:02X}' for b in data])
-            timestamp = datetime.now().strftime("%H:%M:%S.%f")[:-3]
-            self.add_text(self.raw_text, f"[{timestamp}] {hex_str}\n")
-        else:
-            timestamp = datetime.now().strftime("%H:%M:%S.%f")[:-3]
-            self.add_text(self.raw_text, f"[{timestamp}] [大數據包: {len(data)} 字節]\n")
-        
-        # 如果正在等待命令回應，立即檢查是否有命令回應幀
-        if self.waiting_for_response:
-            try:
-                self.check_immediate_command_response()
-            except Exception as e:
-                self.log(f"❌ 命令回應分析錯誤: {e}")
-        
-        # 定時分析機制 - 每0.1秒分析一次（主要用於數據幀）
-        current_time = time.time()
-        if current_time - self.last_analysis_time >= self.analysis_interval:
-            self.last_analysis_time = current_time
-            try:
-                self.analyze_one_frame()
-            except Exception as e:
-                self.log(f"❌ 定時分析錯誤: {e}")
+            return f"[{timestamp}] {data.hex(' ').upper()}\n"
+        return f"[{timestamp}] [大數據包: {len(data)} 字節]\n"
     
-    def check_immediate_command_response(self):
-        """立即檢查命令回應幀 - 用於配置模式下的即時回應"""
-        buffer = bytes(self.raw_buffer)
+    def parse_received_bytes(self, data):
+        """解析接收到的位元組 - 在解析線程執行，不直接操作Tk元件，結果透過隊列送回界面線程"""
+        self.write_raw_buffer(data)
         
-        if len(buffer) < 8:  # 最小命令回應幀長度
+        # 定時分析機制 - 每0.1秒分析一次；等待命令回應時立即分析
+        current_time = time.monotonic()
+        if not self.waiting_for_response and current_time - self.last_analysis_time < self.analysis_interval:
             return
+        self.last_analysis_time = current_time
         
-        # 從最新的數據開始搜索命令回應幀
-        for i in range(len(buffer) - 7, -1, -1):  # 從後往前搜索
-            # 命令回應幀頭 FD FC FB FA
-            if buffer[i:i+4] == b'\xFD\xFC\xFB\xFA':
-                # 檢查數據長度字段
-                if i + 6 < len(buffer):
-                    data_length = buffer[i+4] | (buffer[i+5] << 8)
-                    expected_frame_length = 6 + 2 + data_length + 4  # 頭(4) + 長度(2) + 數據 + 尾(4)
-                    
-                    # 如果緩衝區有足夠的數據
-                    if i + expected_frame_length <= len(buffer):
-                        # 檢查幀尾
-                        tail_start = i + expected_frame_length - 4
-                        if buffer[tail_start:tail_start+4] == b'\x04\x03\x02\x01':
-                            frame = buffer[i:i+expected_frame_length]
-                            
-                            # 立即解析命令回應
-                            frame_hex = ' '.join([f'{b:02X}' for b in frame])
-                            print(f"立即發現命令回應幀: {frame_hex}")
-                            self.parse_command_response(frame)
-                            
-                            # 清理已處理的數據
-                            self.raw_buffer = self.raw_buffer[i+expected_frame_length:]
-                            return
-                
-                # 如果基於長度的方法失敗，使用固定長度搜索
-                for j in range(i + 8, min(i + 40, len(buffer) - 3)):  # 減少搜索範圍
-                    if buffer[j:j+4] == b'\x04\x03\x02\x01':
-                        frame = buffer[i:j+4]
-                        
-                        # 立即解析命令回應
-                        frame_hex = ' '.join([f'{b:02X}' for b in frame])
-                        print(f"立即發現命令回應幀(固定): {frame_hex}")
-                        self.parse_command_response(frame)
-                        
-                        # 清理已處理的數據
-                        self.raw_buffer = self.raw_buffer[j+4:]
-                        return
-    
-    def analyze_one_frame(self):
-        """定時分析：從緩衝區中尋找並分析一個完整幀 - 基於官方LD2412庫實現"""
-        buffer = bytes(self.raw_buffer)
+        # 同一次分析得到的數據幀合併成一條消息送出，命令回應前先送出已累積的數據幀以保持順序
+        records = []
+        try:
+            for frame in self.extract_frames():
+                if frame[0:4] == _DATA_HEADER:
+                    record = self.decode_periodic_data(frame)
+                    if record:
+                        records.append(record)
+                else:
+                    if records:
+                        self.post_message(('frames', records))
+                        records = []
+                    self.post_message(('response', frame))
+            if records:
+                self.post_message(('frames', records))
+        except Exception as e:
+            self.post_message(('error', f"幀分析錯誤: {e}"))
+    
+    def write_raw_buffer(self, data):
+        """寫入接收環形緩衝區 - 寫到尾端時將未解析數據搬回開頭，保持幀連續不被切斷"""
+        buffer = self.raw_buffer
+        capacity = len(buffer)
+        if len(data) >= capacity:
+            data = data[-capacity:]
+        
+        if self.raw_end + len(data) > capacity:
+            unread = self.raw_end - self.raw_start
+            if unread + len(data) > capacity:
+                # 緩衝區已滿，丟棄最舊的數據
+                self.raw_start += unread + len(data) - capacity
+                unread = self.raw_end - self.raw_start
+            buffer[0:unread] = buffer[self.raw_start:self.raw_end]
+            self.raw_start = 0
+            self.raw_end = unread
+        
+        buffer[self.raw_end:self.raw_end + len(data)] = data
+        self.raw_end += len(data)
+    
+    def reset_raw_buffer(self):
+        """清空接收環形緩衝區 - 只能在解析線程呼叫，其他線程請使用 clear_pending_data"""
+        self.raw_start = 0
+        self.raw_end = 0
+    
+    def clear_pending_data(self):
+        """斷開連接時清除未處理的數據 - 緩衝區交由解析線程重置，避免與正在進行的解析競爭
+        
+        解析線程可能仍在處理舊連接的數據，因此界面線程丟棄數據消息直到收到 'reset' 標記
+        """
+        self.awaiting_reset = True
+        try:
+            while True:
+                self.raw_queue.get_nowait()
+        except queue.Empty:
+            pass
+        with self.queue_lock:
+            try:
+                while True:
+                    self.data_queue.get_nowait()
+            except queue.Empty:
+                pass
+        # 清空隊列後才送出重置標記，確保解析線程回覆的 'reset' 不會被清除
+        self.raw_queue.put(_RESET_BUFFER)
+    
+    def extract_frames(self):
+        """從緩衝區依序取出所有完整幀並前移讀取位置 - 以預先編譯的正則表達式單次掃描兩種幀
+        
+        數據幀以 memoryview 直接引用環形緩衝區，須在下一次寫入前解碼完畢；
+        命令回應幀會送到界面線程，因此複製為 bytes
+        """
+        buffer = self.raw_buffer
+        view = memoryview(buffer)
+        size = self.raw_end
+        frames = []
+        log_lines = []  # 調試輸出累積後一次印出，避免每幀各自寫入 stdout
+        pos = self.raw_start
         
-        if len(buffer) < 12:  # 官方庫要求最小12字節
-            return
+        while True:
+            match = _FRAME_RE.search(buffer, pos, size)
+            if not match:
+                break
+            start, pos = match.span()
+            if buffer[start] == 0xF4:
+                frame = view[start:pos]
+                # 驗證幀結構：第7字節=0xAA, 倒數第6字節=0x55
+                if frame[7] == 0xAA and frame[-6] == 0x55:
+                    frames.append(frame)
+                    log_lines.append(f"找到數據幀 (長度={len(frame)}): {frame.hex(' ').upper()}")
+                else:
+                    # 驗證失敗時匹配範圍內可能還有完整的幀，從下一個位元組重新搜尋
+                    pos = start + 1
+            else:
+                # 命令回應數據中可能含有 04 03 02 01，優先根據長度字段計算幀長度：頭(4) + 長度(2) + 數據 + 尾(4)
+                data_length = buffer[start + 4] | (buffer[start + 5] << 8)
+                tail_start = start + 6 + data_length
+                if tail_start + 4 <= size:
+                    if buffer[tail_start:tail_start + 4] == _CMD_TAIL:
+                        pos = tail_start + 4
+                elif data_length <= 54:
+                    # 長度字段所示的幀尚未接收完整，保留至下次分析
+                    pos = start
+                    break
+                frame = bytes(view[start:pos])
+                frames.append(frame)
+                log_lines.append(f"找到命令回應幀 (長度={len(frame)}): {frame.hex(' ').upper()}")
+        
+        # 保留末尾可能尚未接收完整的幀 (最長84字節)，其餘已處理或無法成幀的數據直接略過
+        partial = _HEADER_RE.search(buffer, max(pos, size - 83), size)
+        if partial:
+            pos = partial.start()
+            if buffer[pos] == 0xFD:
+                partial_hex = buffer[pos:min(pos + 20, size)].hex(' ').upper()
+                log_lines.append(f"發現命令回應頭但幀不完整: {partial_hex}...")
+        else:
+            pos = max(pos, size - 3)  # 保留可能不完整的幀頭位元組
         
-        # 尋找最完整的數據幀
-        best_frame = None
-        best_score = 0
-        
-        # 查找所有可能的幀頭位置
-        for i in range(len(buffer) - 11):
-            # 數據幀頭 F4 F3 F2 F1 (官方庫定義)
-            if buffer[i:i+4] == b'\xF4\xF3\xF2\xF1':
-                # 查找數據幀尾 F8 F7 F6 F5 (官方庫定義)
-                for j in range(i + 12, min(i + 80, len(buffer) - 3)):  # 官方庫最大長度約80字節
-                    if buffer[j:j+4] == b'\xF8\xF7\xF6\xF5':
-                        frame = buffer[i:j+4]
-                        
-                        # 驗證幀結構 (根據官方庫)
-                        if len(frame) >= 12:
-                            # 檢查常數值：第7字節=0xAA, 倒數第6字節=0x55
-                            if frame[7] == 0xAA and frame[-6] == 0x55:
-                                frame_len = len(frame)
-                                # 正常模式數據幀(~21字節)和工程模式數據幀(~51字節)都給高分
-                                if frame_len >= 20:  # 正常模式最小長度
-                                    score = 80 + frame_len  # 基礎高分 + 長度獎勵
-                                else:
-                                    score = frame_len  # 短幀低分
-                                if score > best_score:
-                                    best_frame = frame
-                                    best_score = score
-                        break
-            
-            # 命令回應幀頭 FD FC FB FA (官方庫定義)
-            elif buffer[i:i+4] == b'\xFD\xFC\xFB\xFA':
-                # 檢查數據長度字段
-                if i + 6 < len(buffer):
-                    data_length = buffer[i+4] | (buffer[i+5] << 8)
-                    expected_frame_length = 6 + 2 + data_length + 4  # 頭(4) + 長度(2) + 數據 + 尾(4)
-                    
-                    # 如果緩衝區有足夠的數據
-                    if i + expected_frame_length <= len(buffer):
-                        # 檢查幀尾
-                        tail_start = i + expected_frame_length - 4
-                        if buffer[tail_start:tail_start+4] == b'\x04\x03\x02\x01':
-                            frame = buffer[i:i+expected_frame_length]
-                            score = 60  # 命令回應幀得較高分數
-                            if score > best_score:
-                                best_frame = frame
-                                best_score = score
-                            continue
-                
-                # 如果基於長度的方法失敗，使用舊方法
-                for j in range(i + 8, min(i + 60, len(buffer) - 3)):
-                    if buffer[j:j+4] == b'\x04\x03\x02\x01':
-                        frame = buffer[i:j+4]
-                        score = 50  # 命令回應幀得中等分數
-                        if score > best_score:
-                            best_frame = frame
-                            best_score = score
-                        break
+        if log_lines:
+            print('\n'.join(log_lines))
         
-        # 分析最佳幀
-        if best_frame and best_score >= 50:
-            try:
-                if best_frame[0:4] == b'\xF4\xF3\xF2\xF1':
-                    frame_hex = ' '.join([f'{b:02X}' for b in best_frame])
-                    print(f"找到數據幀 (長度={len(best_frame)}, 得分={best_score}): {frame_hex}")
-                    self.parse_periodic_data(best_frame)
-                elif best_frame[0:4] == b'\xFD\xFC\xFB\xFA':
-                    # 調試信息：顯示找到的命令回應幀
-                    frame_hex = ' '.join([f'{b:02X}' for b in best_frame])
-                    print(f"找到命令回應幀 (長度={len(best_frame)}): {frame_hex}")
-                    self.parse_command_response(best_frame)
-                    
-                # 分析完成後，保守地清理緩衝區
-                if len(self.raw_buffer) > 1000:
-                    self.raw_buffer = self.raw_buffer[-500:]
-                    
-            except Exception as e:
-                self.log(f"❌ 幀分析錯誤: {e}")
+        # 前移讀取位置，已處理的數據不需搬移
+        if pos >= size:
+            self.raw_start = self.raw_end = 0
         else:
-            # 如果沒有找到完整幀，但找到了命令回應頭，顯示調試信息
-            for i in range(len(buffer) - 3):
-                if buffer[i:i+4] == b'\xFD\xFC\xFB\xFA':
-                    partial_data = buffer[i:min(i+20, len(buffer))]
-                    partial_hex = ' '.join([f'{b:02X}' for b in partial_data])
-                    print(f"發現命令回應頭但幀不完整: {partial_hex}...")
-                    break
+            self.raw_start = pos
+        return frames
 
     def parse_periodic_data(self, frame):
-        """解析週期性數據幀 - 基於協議文檔實現"""
+        """解析並套用週期性數據幀"""
+        record = self.decode_periodic_data(frame)
+        if record:
+            self.apply_periodic_data(record)
+    
+    def decode_periodic_data(self, frame):
+        """解碼週期性數據幀 - 基於協議文檔實現，可在讀取線程執行（不操作Tk元件）"""
         if len(frame) < 21:  # 一般模式最小幀長度
             print(f"幀太短: {len(frame)} < 21")
             return
@@ -1166,17 +1401,10 @@ class DarkLD2412GUI:
                 print(f"一般模式尾部標識錯誤: frame[15]=0x{frame[15]:02X}, 應該是0x55")
                 return
         
-        self.stats['total_frames'] += 1
-        
-        # 根據協議文檔的數據幀結構解析
-        frame_length = frame[4] | (frame[5] << 8)      # 第4-5字節：數據長度（小端序）
-        target_state = frame[8]                         # 第8字節：目標狀態
-        
-        # 基本距離和能量數據（協議文檔字節位置）
-        move_dist = frame[9] | (frame[10] << 8)         # 第9-10字節：移動目標距離（小端序）
-        move_energy = frame[11]                         # 第11字節：移動目標能量值
-        still_dist = frame[12] | (frame[13] << 8)       # 第12-13字節：靜止目標距離（小端序）
-        still_energy = frame[14]                        # 第14字節：靜止目標能量值
+        # 根據協議文檔的數據幀結構解析 - 第4-14字節一次解包
+        # 數據長度(u16) 數據類型 幀頭 目標狀態 移動距離(u16) 移動能量 靜止距離(u16) 靜止能量，皆為小端序
+        (frame_length, data_type, head_byte, target_state,
+         move_dist, move_energy, still_dist, still_energy) = _FRAME_FIELDS.unpack_from(frame, 4)
         
         # 判斷模式
         engineering_mode = (data_type == 0x01)          # 0x01=工程模式, 0x02=一般模式
@@ -1210,14 +1438,12 @@ class DarkLD2412GUI:
         # 檢測距離計算
         detect_dist = max(move_dist, still_dist) if move_dist > 0 or still_dist > 0 else 0
         
-        # 更新數據
-        self.update_data_history(move_dist, move_energy, still_dist, still_energy, detect_dist, target_state, light_value)
-        
         mode = '工程模式' if engineering_mode else '一般模式'
-        self.current_data = {
+        return {
             'timestamp': datetime.now(),
             'mode': mode,
             'state': target_state,
+            'state_text': _STATE_TEXT[target_state],
             'move_dist': move_dist,
             'move_energy': move_energy,
             'still_dist': still_dist,
@@ -1227,24 +1453,36 @@ class DarkLD2412GUI:
             'frame_len': len(frame),
             'data_type': data_type,
             'frame_length': frame_length,
-            'head_byte': frame[7],
+            'head_byte': head_byte,
             'moving_gate_energies': moving_gate_energies,
             'still_gate_energies': still_gate_energies,
             'moving_gates_count': moving_gates_count,
             'still_gates_count': still_gates_count
         }
+    
+    def apply_periodic_data(self, record, timestamp=None):
+        """套用已解碼的數據幀 - 更新統計、歷史與顯示（界面線程），timestamp 為本次更新共用的時間戳"""
+        self.stats['total_frames'] += 1
+        self.display_dirty = True
+        self.chart_dirty = True
         
-        # 顯示解析結果
-        self.display_parsed_result(engineering_mode)
+        # 更新數據
+        self.update_data_history(record['move_dist'], record['move_energy'], record['still_dist'],
+                                 record['still_energy'], record['detect_dist'], record['state'], record['light'])
+        self.current_data = record
+        
+        # 顯示解析結果 (詳細解析分頁不可見時跳過格式化)
+        if self.detail_visible:
+            self.display_parsed_result(record['data_type'] == 0x01, timestamp)
         
         # 檢查警報
-        self.check_alerts(detect_dist, move_energy, still_energy)
+        self.check_alerts(record['detect_dist'], record['move_energy'], record['still_energy'])
 
-    def display_parsed_result(self, engineering_mode):
+    def display_parsed_result(self, engineering_mode, timestamp=None):
         """顯示解析結果"""
         data = self.current_data
-        state_text = self.get_state_text(data['state'])
-        timestamp = datetime.now().strftime("%H:%M:%S.%f")[:-3]
+        if timestamp is None:
+            timestamp = self.get_timestamp()
         
         if engineering_mode:
             # 格式化門能量顯示 - 根據協議文檔更新
@@ -1268,28 +1506,14 @@ class DarkLD2412GUI:
             gate_count = data.get('moving_gates_count', 13)
             gate_info = f"距離門範圍: 0-{gate_count} (共{gate_count+1}門), 每門0.75m"
             
-            result = f"""[{timestamp}] 📡 工程模式數據幀 #{self.stats['total_frames']}
-幀結構: 長度={data['frame_len']}字節, 數據類型=0x{data['data_type']:02X}, 校驗=0x{data['head_byte']:02X}
-目標狀態: {state_text} (0x{data['state']:02X})
-基本數據: 移動距離={data['move_dist']:4d}cm/能量={data['move_energy']:3d}, 靜止距離={data['still_dist']:4d}cm/能量={data['still_energy']:3d}
-光感數據: {data['light']:3d} (0x{data['light']:02X}) - 範圍0-255，值越大表示光線越強
-檢測距離: {data['detect_dist']:4d}cm (綜合距離)
-{gate_info}
-門能量分布:{moving_info}{still_info}
-{"="*60}
-"""
+            result = _ENGINEERING_FRAME_TMPL.format(
+                ts=timestamp, frame_no=self.stats['total_frames'],
+                gate_info=gate_info, moving_info=moving_info, still_info=still_info, **data)
         else:
-            result = f"""[{timestamp}] 📊 一般模式數據幀 #{self.stats['total_frames']}
-幀結構: 長度={data['frame_len']}字節, 數據類型=0x{data['data_type']:02X}, 校驗=0x{data['head_byte']:02X}
-目標狀態: {state_text} (0x{data['state']:02X})
-基本數據: 移動距離={data['move_dist']:4d}cm/能量={data['move_energy']:3d}, 靜止距離={data['still_dist']:4d}cm/能量={data['still_energy']:3d}
-檢測距離: {data['detect_dist']:4d}cm
-光感數據: {data['light']:3d} (工程模式下可用)
-💡 提示: 開啟工程模式可查看詳細門能量分布
-{"="*60}
-"""
+            result = _NORMAL_FRAME_TMPL.format(
+                ts=timestamp, frame_no=self.stats['total_frames'], **data)
         
-        self.add_text(self.detailed_text, result)
+        self.detailed_pending.append(result)
 
     def parse_frame(self, frame):
         """舊的解析函數 - 保持向後兼容"""
@@ -1305,43 +1529,26 @@ class DarkLD2412GUI:
         pass
     
     def update_data_history(self, move_dist, move_energy, still_dist, still_energy, detect_dist, target_state, light_value):
-        """更新數據歷史記錄"""
-        current_time = time.time() - self.stats['start_time']
-        self.data_history['time'].append(current_time)
-        self.data_history['moving_distance'].append(move_dist)
-        self.data_history['moving_energy'].append(move_energy)
-        self.data_history['still_distance'].append(still_dist)
-        self.data_history['still_energy'].append(still_energy)
-        self.data_history['detection_distance'].append(detect_dist)
-        self.data_history['target_state'].append(target_state)
-        self.data_history['light_value'].append(light_value)
-        
-        # 更新統計
-        self.update_statistics(target_state, detect_dist)
-    
-    def update_statistics(self, state, detect_dist):
-        """更新統計數據 - 根據協議文檔修正"""
-        # 根據協議文檔的狀態值進行統計
-        if state == 0x01:  # 運動目標
-            self.stats['moving_detections'] += 1
-        elif state == 0x02:  # 靜止目標
-            self.stats['still_detections'] += 1
-        elif state == 0x03:  # 運動&靜止目標
-            self.stats['moving_detections'] += 1
-            self.stats['still_detections'] += 1
-        elif state == 0x00:  # 無目標
-            self.stats['no_target'] += 1
-        # 0x04-0x06 是底噪檢測狀態，不計入目標統計
+        """更新數據歷史記錄與統計數據 - 根據協議文檔修正"""
+        stats = self.stats
+        self.data_history.append(time.monotonic() - stats['start_time'], move_dist, move_energy,
+                                 still_dist, still_energy, detect_dist, target_state, light_value)
+        
+        # 根據協議文檔的狀態值查表統計（0x04-0x06 是底噪檢測狀態，不計入目標統計）
+        if target_state < 8:
+            moving, still, no_target = _STATE_INC[target_state]
+            stats['moving_detections'] += moving
+            stats['still_detections'] += still
+            stats['no_target'] += no_target
         
         # 更新距離統計（只有在有目標時才統計距離）
-        if state in [0x01, 0x02, 0x03] and detect_dist > 0:
-            self.stats['max_distance'] = max(self.stats['max_distance'], detect_dist)
-            if self.stats['min_distance'] == 9999:
-                self.stats['min_distance'] = detect_dist
-            else:
-                self.stats['min_distance'] = min(self.stats['min_distance'], detect_dist)
+        if 0 < target_state < 4 and detect_dist > 0:
+            if detect_dist > stats['max_distance']:
+                stats['max_distance'] = detect_dist
+            if detect_dist < stats['min_distance'] or stats['min_distance'] == 9999:
+                stats['min_distance'] = detect_dist
         
-        self.stats['last_update'] = time.time()
+        stats['last_update'] = time.time()
     
     def check_alerts(self, distance, move_energy, still_energy):
         """檢查警報"""
@@ -1359,26 +1566,20 @@ class DarkLD2412GUI:
             self.log(alert)
     
     def get_state_text(self, state):
-        """獲取狀態文字描述 - 根據協議文檔修正"""
-        # 根據協議文檔的目標狀態位解析表
-        state_map = {
-            0x00: "❌ 無目標",
-            0x01: "🏃 運動目標", 
-            0x02: "🧍 靜止目標",
-            0x03: "🏃🧍 運動&靜止目標",
-            0x04: "🔍 正在底噪檢測中",
-            0x05: "✅ 底噪檢測成功", 
-            0x06: "❌ 底噪檢測失敗"
-        }
-        
-        return state_map.get(state, f"❓ 未知狀態(0x{state:02X})")
+        """獲取狀態文字描述 - 根據協議文檔修正，以預先建立的查表取得"""
+        if 0 <= state < 256:
+            return _STATE_TEXT[state]
+        return f"❓ 未知狀態(0x{state:02X})"
     
     def update_realtime_display(self):
-        """更新即時數據顯示"""
+        """更新即時數據顯示 - 沒有新數據幀時不重新格式化"""
+        if self.current_data is self.realtime_shown_data or not self.realtime_text.winfo_viewable():
+            return
+        
         try:
             if self.current_data:
                 data = self.current_data
-                state_text = self.get_state_text(data['state'])
+                state_text = data['state_text']
                 mode = data.get('mode', '未知')
                 
                 # 基本信息顯示
@@ -1440,20 +1641,10 @@ class DarkLD2412GUI:
 ║ 最後更新: {data['timestamp'].strftime('%H:%M:%S.%f')[:-3]:<30} ║
 ╚══════════════════════════════════════════════════╝"""
             else:
-                realtime_info = """╔══════════════════════════════════════════════════╗
-║                   即時數據分析                     ║
-╠══════════════════════════════════════════════════╣
-║ 工作模式: 等待數據...                            ║
-║ 目標狀態: 等待數據...                            ║
-║ 移動距離:   -- cm    移動能量:  --              ║
-║ 靜止距離:   -- cm    靜止能量:  --              ║
-║ 檢測距離:   -- cm    光感值:   --              ║
-║                                                  ║
-║ 請先連接設備並開始監控                           ║
-╚══════════════════════════════════════════════════╝"""
+                realtime_info = _REALTIME_WAITING_TEXT
             
-            self.realtime_text.delete(1.0, tk.END)
-            self.realtime_text.insert(1.0, realtime_info)
+            self.set_text_content(self.realtime_text, realtime_info)
+            self.realtime_shown_data = self.current_data
             
         except Exception as e:
             # 如果即時顯示更新失敗，顯示錯誤信息
@@ -1464,14 +1655,20 @@ class DarkLD2412GUI:
 ║                                                  ║
 ║ 請檢查數據格式或重新連接設備                     ║
 ╚══════════════════════════════════════════════════╝"""
-            self.realtime_text.delete(1.0, tk.END)
-            self.realtime_text.insert(1.0, error_info)
+            self.set_text_content(self.realtime_text, error_info)
     
     def update_stats_display(self):
-        """更新統計顯示"""
-        runtime = time.time() - self.stats['start_time']
+        """更新統計顯示 - 統計分頁不可見時只更新頂部狀態"""
+        runtime = time.monotonic() - self.stats['start_time']
         total = self.stats['total_frames']
         
+        # 更新頂部狀態
+        self.set_label_text(self.frame_count_label, f"數據幀: {total}")
+        self.set_label_text(self.fps_label, f"幀率: {total/max(runtime,1):.1f}/s")
+        
+        if not self.stats_text.winfo_viewable():
+            return
+        
         if total > 0:
             moving_rate = (self.stats['moving_detections'] / total) * 100
             still_rate = (self.stats['still_detections'] / total) * 100
@@ -1502,28 +1699,22 @@ class DarkLD2412GUI:
 ║ 請先連接設備並發送啟動命令               ║
 ╚════════════════════════════════════════╝"""
         
-        self.stats_text.delete(1.0, tk.END)
-        self.stats_text.insert(1.0, stats_info)
-        
-        # 更新頂部狀態
-        self.frame_count_label.config(text=f"數據幀: {total}")
-        self.fps_label.config(text=f"幀率: {total/max(runtime,1):.1f}/s")
+        self.set_text_content(self.stats_text, stats_info)
     
     def update_chart_display(self):
         """更新門能量分布圖 - 根據可用性選擇實現"""
         try:
             # 如果圖表被凍結，不更新
-            if hasattr(self, 'chart_frozen') and self.chart_frozen:
+            if self.chart_frozen:
                 return
             
             # 根據matplotlib可用性選擇實現
-            if MATPLOTLIB_AVAILABLE and hasattr(self, 'fig'):
+            if self.use_matplotlib:
                 self.update_matplotlib_charts()
             else:
                 self.update_text_charts()
             
         except Exception as e:
-            import traceback
             print(f"圖表更新錯誤: {e}")
             print(traceback.format_exc())
     
@@ -1547,7 +1738,7 @@ class DarkLD2412GUI:
             safe_still = (safe_still + [0] * 14)[:14]
             
             # 更新柱狀圖
-            if hasattr(self, 'moving_bars') and hasattr(self, 'still_bars'):
+            if self.use_matplotlib:
                 for i, (bar_m, bar_s) in enumerate(zip(self.moving_bars, self.still_bars)):
                     bar_m.set_height(safe_moving[i])
                     bar_s.set_height(safe_still[i])
@@ -1570,8 +1761,12 @@ class DarkLD2412GUI:
                 self.ax1.set_ylim(0, max_energy * 1.1)
                 self.ax2.set_ylim(0, max_energy * 1.1)
                 
-                # 在圖表上顯示每個門的敏感度線（小標記）
-                self.draw_individual_sensitivity_markers()
+                # 在圖表上顯示每個門的敏感度線（小標記），敏感度或模式改變時才重建
+                marker_key = (tuple(self.moving_gate_sensitivities), tuple(self.still_gate_sensitivities),
+                              self.current_data.get('mode'))
+                if marker_key != self.sensitivity_marker_key:
+                    self.sensitivity_marker_key = marker_key
+                    self.draw_individual_sensitivity_markers()
             
             # 更新距離趨勢圖
             self.update_distance_trend()
@@ -1618,13 +1813,13 @@ class DarkLD2412GUI:
         """更新距離趨勢圖"""
         try:
             # 獲取最近30個數據點
-            if len(self.data_history['time']) < 2:
+            if len(self.data_history) < 2:
                 return
             
-            times = list(self.data_history['time'])[-30:]
-            detect_distances = list(self.data_history['detection_distance'])[-30:]
-            moving_distances = list(self.data_history['moving_distance'])[-30:]
-            still_distances = list(self.data_history['still_distance'])[-30:]
+            times = self.data_history.latest('time', 30)
+            detect_distances = self.data_history.latest('detection_distance', 30)
+            moving_distances = self.data_history.latest('moving_distance', 30)
+            still_distances = self.data_history.latest('still_distance', 30)
             
             # 更新線條數據
             self.distance_line.set_data(times, detect_distances)
@@ -1651,50 +1846,11 @@ class DarkLD2412GUI:
             moving_data = moving_energies + [moving_energies[0]]
             still_data = still_energies + [still_energies[0]]
             
-            # 清除舊的圖形
-            self.ax4.clear()
-            
-            # 重新設置極座標軸屬性
-            self.ax4.set_facecolor('#3c3c3c')
-            self.ax4.tick_params(colors='white', labelsize=8)
-            self.ax4.grid(True, color='white', alpha=0.3)
-            self.ax4.set_theta_offset(np.pi / 2)
-            self.ax4.set_theta_direction(-1)
-            self.ax4.set_ylim(0, 100)
-            
-            # 檢查是否有中文字體支援
-            has_chinese = 'PingFang SC' in plt.rcParams['font.sans-serif'][0] or 'Arial Unicode MS' in plt.rcParams['font.sans-serif'][0]
-            
-            if has_chinese:
-                moving_label = '移動目標'
-                still_label = '靜止目標'
-                gate_labels = [f'門{i:02d}' for i in range(14)]
-                title = '🎯 門能量雷達圖'
-            else:
-                moving_label = 'Moving Target'
-                still_label = 'Static Target'
-                gate_labels = [f'G{i:02d}' for i in range(14)]
-                title = '🎯 Gate Energy Radar'
-            
-            # 繪製雷達圖
-            self.ax4.plot(self.radar_angles, moving_data, 'o-', linewidth=2, color='#4a9eff', 
-                         alpha=0.8, label=moving_label, markersize=4)
-            self.ax4.fill(self.radar_angles, moving_data, alpha=0.25, color='#4a9eff')
-            
-            self.ax4.plot(self.radar_angles, still_data, 'o-', linewidth=2, color='#ef4444', 
-                         alpha=0.8, label=still_label, markersize=4)
-            self.ax4.fill(self.radar_angles, still_data, alpha=0.25, color='#ef4444')
-            
-            # 設置標題和圖例
-            self.ax4.set_title(title, color='#fbbf24', fontsize=12, fontweight='bold', pad=15)
-            self.ax4.legend(loc='upper right', bbox_to_anchor=(1.8, 1.1), fontsize=9)  # 從1.3調整到1.8，增加約200像素的距離
-            
-            # 設置門號標籤
-            self.ax4.set_thetagrids(np.degrees(self.radar_angles[:-1]), gate_labels, fontsize=8)
-            
-            # 設置徑向標籤
-            self.ax4.set_yticks([20, 40, 60, 80, 100])
-            self.ax4.set_yticklabels(['20', '40', '60', '80', '100'], fontsize=7)
+            # 只更新既有線條與填充的頂點，不清除重建整個極座標軸
+            self.radar_moving.set_data(self.radar_angles, moving_data)
+            self.radar_still.set_data(self.radar_angles, still_data)
+            self.radar_moving_fill.set_xy(np.column_stack((self.radar_angles, moving_data)))
+            self.radar_still_fill.set_xy(np.column_stack((self.radar_angles, still_data)))
             
         except Exception as e:
             print(f"雷達圖更新錯誤: {e}")
@@ -1877,15 +2033,13 @@ class DarkLD2412GUI:
             if safe_moving:
                 moving_chart = self.create_individual_gate_chart("移動目標", safe_moving, self.moving_gate_sensitivities, 
                                                                14, 100, 12, "█", timestamp, light_value, detect_dist)
-                self.moving_chart_text.delete(1.0, tk.END)
-                self.moving_chart_text.insert(1.0, moving_chart)
+                self.set_text_content(self.moving_chart_text, moving_chart)
             
             # 創建靜止目標圖表 - 使用個別門敏感度
             if safe_still:
                 still_chart = self.create_individual_gate_chart("靜止目標", safe_still, self.still_gate_sensitivities,
                                                               14, 100, 12, "▓", timestamp, light_value, detect_dist)
-                self.still_chart_text.delete(1.0, tk.END)
-                self.still_chart_text.insert(1.0, still_chart)
+                self.set_text_content(self.still_chart_text, still_chart)
                 
         except Exception as e:
             print(f"文字圖表更新錯誤: {e}")
@@ -2189,7 +2343,7 @@ class DarkLD2412GUI:
     
     def show_distance_trend(self):
         """顯示距離趨勢圖 (正常模式)"""
-        if len(self.data_history['detection_distance']) < 5:
+        if len(self.data_history) < 5:
             chart = """門能量分布圖 (等待工程模式數據...)
 
 請執行以下步驟查看門能量分布:
@@ -2199,48 +2353,82 @@ class DarkLD2412GUI:
 
 正常模式下顯示距離趨勢:
 """
-            self.chart_text.delete(1.0, tk.END)
-            self.chart_text.insert(1.0, chart)
+            self.set_text_content(self.chart_text, chart)
             return
         
         # 獲取最近30個數據點
-        data = list(self.data_history['detection_distance'])[-30:]
+        data = self.data_history.latest('detection_distance', 30)
         if not data or max(data) == 0:
             return
         
-        max_val = max(data)
-        min_val = min([d for d in data if d > 0]) if any(d > 0 for d in data) else 0
-        height = 15
+        chart = """距離趨勢圖 (正常模式)
+請見下方趨勢圖
+
+提示: 開啟工程模式可查看詳細門能量分布"""
         
-        chart = f"""距離趨勢圖 (正常模式 - 最近{len(data)}個數據點)
-最大值: {max_val} cm  最小值: {min_val} cm
-{'='*60}
-"""
+        # 正常模式下，兩個視窗都顯示相同提示（內容不變時不會重繪）
+        self.set_text_content(self.moving_chart_text, chart)
         
-        # 繪製圖表
-        for h in range(height, 0, -1):
-            threshold = min_val + (max_val - min_val) * h / height if max_val > min_val else min_val
-            line = f"{threshold:4.0f} |"
-            for val in data:
-                if val >= threshold:
-                    line += "█"
-                elif val > 0:
-                    line += "░"
-                else:
-                    line += " "
-            chart += line + "\n"
+        self.set_text_content(self.still_chart_text, chart)
         
-        chart += "     " + "-" * len(data) + "\n"
-        chart += "     " + "".join([str(i % 10) for i in range(len(data))]) + "\n"
-        chart += "\n█ = 檢測到目標  ░ = 低於閾值  空白 = 無目標\n"
-        chart += "提示: 開啟工程模式可查看詳細門能量分布"
+        self.draw_trend_bars(data)
+    
+    def draw_trend_bars(self, data):
+        """在 Canvas 上繪製距離趨勢 - 重用長條項目，只更新座標"""
+        canvas = self.trend_canvas
+        if canvas is None:
+            return
         
-        # 正常模式下，兩個視窗都顯示相同內容
-        self.moving_chart_text.delete(1.0, tk.END)
-        self.moving_chart_text.insert(1.0, chart)
+        # 首次繪製時建立固定數量的長條與標籤項目
+        if not self.trend_bars:
+            self.trend_bars = [canvas.create_rectangle(0, 0, 0, 0, fill=self.colors['accent_green'], outline='')
+                               for _ in range(30)]
+            self.trend_label = canvas.create_text(5, 5, anchor=tk.NW, fill=self.colors['fg_primary'],
+                                                  font=("Courier", 10))
         
-        self.still_chart_text.delete(1.0, tk.END)
-        self.still_chart_text.insert(1.0, chart)
+        width = max(canvas.winfo_width(), 1)
+        height = max(canvas.winfo_height(), 1)
+        top = 22  # 保留標籤空間
+        bar_width = width / len(self.trend_bars)
+        
+        max_val = max(data)
+        min_val = min([d for d in data if d > 0]) if any(d > 0 for d in data) else 0
+        
+        for i, bar in enumerate(self.trend_bars):
+            val = data[i] if i < len(data) else 0
+            if val > 0:
+                h = int(val * (height - top) / max_val)
+                x = i * bar_width
+                canvas.coords(bar, x + 1, height - h, x + bar_width - 1, height)
+            else:
+                canvas.coords(bar, 0, 0, 0, 0)
+        
+        canvas.itemconfig(self.trend_label,
+                          text=f"最近{len(data)}個數據點  最大值: {max_val} cm  最小值: {min_val} cm")
+    
+    def set_label_text(self, label, text, **options):
+        """更新標籤文字 - 與上次顯示內容相同時跳過 config 呼叫"""
+        if self.last_widget_text.get(label) == text:
+            return
+        self.last_widget_text[label] = text
+        label.config(text=text, **options)
+    
+    def set_text_content(self, widget, text):
+        """覆寫文本框內容 - 與上次顯示內容相同時跳過刪除/插入重繪"""
+        if self.last_widget_text.get(widget) == text:
+            return
+        self.last_widget_text[widget] = text
+        widget.delete(1.0, tk.END)
+        widget.insert(1.0, text)
+    
+    def flush_pending_text(self):
+        """將本次更新累積的原始數據與詳細解析文本一次性插入"""
+        if self.raw_pending:
+            self.add_text(self.raw_text, ''.join(self.raw_pending))
+            self.raw_pending.clear()
+        if self.detailed_pending:
+            self.add_text(self.detailed_text, ''.join(self.detailed_pending))
+            self.detailed_pending.clear()
     
     def add_text(self, widget, text):
         """添加文字到文本框 - 優化版本"""
@@ -2248,10 +2436,10 @@ class DarkLD2412GUI:
             widget.insert(tk.END, text)
             widget.see(tk.END)
             
-            # 更積極的行數限制，避免記憶體問題
-            lines = widget.get("1.0", tk.END).split('\n')
-            if len(lines) > 100:  # 減少最大行數
-                widget.delete("1.0", f"{len(lines)-50}.0")  # 保留最近50行
+            # 更積極的行數限制，避免記憶體問題 - 以索引取得行數，不讀取整個文本內容
+            line_count = int(widget.index('end-1c').split('.')[0])
+            if line_count > 100:  # 減少最大行數
+                widget.delete("1.0", f"{line_count-50}.0")  # 保留最近50行
         except Exception as e:
             # 如果文本框操作失敗，記錄到控制台
             print(f"文本框操作錯誤: {e}")
@@ -2289,7 +2477,8 @@ class DarkLD2412GUI:
                 self.serial_port = Serial(
                     port=self.port_name, 
                     baudrate=self.baud_rate, 
-                    timeout=1,
+                    timeout=0.5,  # 閒置時每0.5秒返回一次，斷開時由 cancel_read 立即中斷
+                    inter_byte_timeout=0.01,
                     bytesize=serial.EIGHTBITS,
                     parity=serial.PARITY_NONE,
                     stopbits=serial.STOPBITS_ONE
@@ -2301,7 +2490,7 @@ class DarkLD2412GUI:
                     self.is_monitoring = False  # 重置監控狀態
                     self.connect_btn.config(text="🔌 斷開")
                     self.monitor_btn.config(text="▶️ 開始監控")  # 重置監控按鈕
-                    self.status_label.config(text="🟢 已連接", fg=self.colors['accent_green'])
+                    self.set_label_text(self.status_label, "🟢 已連接", fg=self.colors['accent_green'])
                     self.config_label.config(text="📝 正常模式")
                     self.log(f"✅ 成功連接 {self.port_name} ({self.baud_rate})")
                     
@@ -2338,12 +2527,12 @@ class DarkLD2412GUI:
                 
             except Exception as e:
                 self.log(f"❌ 未知錯誤: {e}")
-                import traceback
                 traceback.print_exc()  # 輸出完整錯誤信息到控制台
                 messagebox.showerror("連接錯誤", f"連接失敗\n\n錯誤詳情: {e}\n\n請檢查設備連接")
         else:
             # 完全斷開連接
             self.is_monitoring = False
+            self.cancel_serial_read()
             if self.serial_port and self.serial_port.is_open:
                 try:
                     self.serial_port.close()
@@ -2355,19 +2544,14 @@ class DarkLD2412GUI:
             # 重置UI狀態
             self.connect_btn.config(text="🔌 連接")
             self.monitor_btn.config(text="▶️ 開始監控")
-            self.status_label.config(text="🔴 已斷開", fg=self.colors['accent_red'])
+            self.set_label_text(self.status_label, "🔴 已斷開", fg=self.colors['accent_red'])
             self.config_label.config(text="📝 正常模式", fg=self.colors['fg_secondary'])
             
             # 重置狀態變量
             self.is_config_mode = False
             
             # 清理數據緩衝區
-            self.raw_buffer.clear()
-            while not self.data_queue.empty():
-                try:
-                    self.data_queue.get_nowait()
-                except:
-                    break
+            self.clear_pending_data()
                     
             self.log("🔌 已斷開連接")
     
@@ -2379,32 +2563,22 @@ class DarkLD2412GUI:
         
         self.is_monitoring = not self.is_monitoring
         if self.is_monitoring:
+            self.reader_wakeup.set()
             self.monitor_btn.config(text="⏹️ 停止監控")
             self.log("🔍 開始監控")
         else:
             self.monitor_btn.config(text="▶️ 開始監控")
             self.log("⏹️ 停止監控")
     
-    def send_command(self, hex_string):
-        """發送命令"""
+    def send_command(self, hex_string, cmd_bytes=None, drain=False):
+        """發送命令 - cmd_bytes 為預先解析的命令位元組，未提供時從快取取得 hex_string 的解析結果"""
         if not self.is_connected:
             messagebox.showwarning("警告", "請先連接串列埠")
             return
         
-        # 檢查命令間隔，避免發送過快 - 配置模式下減少間隔
-        current_time = time.time()
-        min_interval = 0.1 if self.is_config_mode else 0.2  # 配置模式下0.1秒間隔
-        if current_time - self.last_command_time < min_interval:
-            time.sleep(min_interval - (current_time - self.last_command_time))
-        
         try:
-            cmd = bytes.fromhex(hex_string.replace(" ", ""))
-            self.serial_port.write(cmd)
-            self.serial_port.flush()
-            
-            # 設置命令等待狀態
-            self.last_command_time = time.time()
-            self.waiting_for_response = True
+            cmd = cmd_bytes if cmd_bytes is not None else _parse_command(hex_string)
+            self.write_command(cmd, drain)
             self.last_command_sent = hex_string
             
             self.log(f"📤 {hex_string}")
@@ -2476,6 +2650,25 @@ class DarkLD2412GUI:
             self.log(f"❌ 發送失敗: {e}")
             messagebox.showerror("發送錯誤", f"命令發送失敗\n{e}")
     
+    def write_command(self, cmd, drain=False):
+        """寫入命令位元組並設置等待回應狀態
+        
+        drain=True 時會等待串列埠實際送出所有位元組 (tcdrain)，一般命令交由系統緩衝即可
+        """
+        # 檢查命令間隔，避免發送過快 - 配置模式下減少間隔
+        current_time = time.monotonic()
+        min_interval = 0.1 if self.is_config_mode else 0.2  # 配置模式下0.1秒間隔
+        if current_time - self.last_command_time < min_interval:
+            time.sleep(min_interval - (current_time - self.last_command_time))
+        
+        self.serial_port.write(cmd)
+        if drain:
+            self.serial_port.flush()
+        
+        # 設置命令等待狀態
+        self.last_command_time = time.monotonic()
+        self.waiting_for_response = True
+    
     def send_custom_command(self):
         """發送自定義命令"""
         hex_string = self.custom_cmd_var.get().strip()
@@ -2491,12 +2684,18 @@ class DarkLD2412GUI:
         # 清除顯示
         self.raw_text.delete(1.0, tk.END)
         self.detailed_text.delete(1.0, tk.END)  # 清除詳細解析分頁
+        self.raw_pending.clear()
+        self.detailed_pending.clear()
         self.moving_chart_text.delete(1.0, tk.END)
         self.still_chart_text.delete(1.0, tk.END)
+        self.last_widget_text.pop(self.moving_chart_text, None)
+        self.last_widget_text.pop(self.still_chart_text, None)
+        if self.trend_canvas is not None:
+            for bar in self.trend_bars:
+                self.trend_canvas.coords(bar, 0, 0, 0, 0)
         
         # 清除歷史數據
-        for key in self.data_history:
-            self.data_history[key].clear()
+        self.data_history.clear()
         
         # 重置統計
         self.stats = {
@@ -2504,13 +2703,15 @@ class DarkLD2412GUI:
             'moving_detections': 0,
             'still_detections': 0,
             'no_target': 0,
-            'start_time': time.time(),
+            'start_time': time.monotonic(),
             'max_distance': 0,
             'min_distance': 9999,
             'last_update': time.time()
         }
         
         self.current_data = None
+        self.display_dirty = True
+        self.chart_dirty = True
     
     def quick_start(self):
         """快速開始 - 一鍵開啟監控並啟動數據輸出"""
@@ -2521,21 +2722,31 @@ class DarkLD2412GUI:
         # 開始監控
         if not self.is_monitoring:
             self.is_monitoring = True
+            self.reader_wakeup.set()
             self.monitor_btn.config(text="⏹️ 停止監控")
         
         # 發送啟動數據輸出命令
-        self.send_command("FD FC FB FA 02 00 12 00 04 03 02 01")
+        self.send_command(_CMD_QUERY, _CMD_QUERY_BYTES)
+    
+    def get_timestamp(self):
+        """取得目前時間戳 (HH:MM:SS.mmm) - 秒級部分快取，避免每次呼叫 strftime"""
+        now = time.time()
+        second = int(now)
+        cached_second, text = self.last_ts  # 界面與解析線程共用，整組讀寫避免秒數與文字不一致
+        if second != cached_second:
+            text = time.strftime("%H:%M:%S", time.localtime(second))
+            self.last_ts = (second, text)
+        return f"{text}.{int((now - second) * 1000):03d}"
     
     def log(self, message):
         """記錄日誌"""
-        timestamp = datetime.now().strftime("%H:%M:%S.%f")[:-3]
+        timestamp = self.get_timestamp()
         log_entry = f"[{timestamp}] {message}\n"
         self.add_text(self.log_text, log_entry)
     
     def check_port_exists(self, port_name):
         """檢查串列埠是否存在"""
         try:
-            import os
             return os.path.exists(port_name)
         except:
             return False
@@ -2543,27 +2754,25 @@ class DarkLD2412GUI:
     def get_available_ports(self):
         """獲取可用的串列埠列表"""
         try:
-            import serial.tools.list_ports
-            ports = []
-            for port, desc, hwid in serial.tools.list_ports.comports():
-                ports.append((port, desc))
-            return ports
-        except ImportError:
+            if list_ports is not None:
+                ports = []
+                for port, desc, hwid in list_ports.comports():
+                    ports.append((port, desc))
+                return ports
+            
             # 如果沒有安裝 pyserial 的 tools，手動檢查常見埠
-            import glob
-            import os
-            possible_ports = []
+            # 只列出一次 /dev，列出的項目即為存在的設備，不需再逐一檢查
+            try:
+                names = os.listdir('/dev')
+            except OSError:
+                return []
             
             # macOS 常見串列埠
-            patterns = ['/dev/cu.*', '/dev/tty.usb*', '/dev/tty.wchusbserial*']
-            for pattern in patterns:
-                possible_ports.extend(glob.glob(pattern))
-            
-            # 過濾存在的埠
+            patterns = ['cu.*', 'tty.usb*', 'tty.wchusbserial*']
             ports = []
-            for port in possible_ports:
-                if os.path.exists(port):
-                    ports.append((port, "串列埠設備"))
+            for pattern in patterns:
+                for name in fnmatch.filter(names, pattern):
+                    ports.append((f"/dev/{name}", "串列埠設備"))
             
             return ports
         except Exception as e:
@@ -2601,6 +2810,7 @@ class DarkLD2412GUI:
     
     def auto_disconnect(self):
         """自動斷開連接"""
+        self.cancel_serial_read()
         try:
             if self.serial_port and self.serial_port.is_open:
                 self.serial_port.close()
@@ -2612,21 +2822,16 @@ class DarkLD2412GUI:
         self.is_monitoring = False
         self.connect_btn.config(text="🔌 連接")
         self.monitor_btn.config(text="▶️ 開始監控")
-        self.status_label.config(text="🔴 已斷開", fg=self.colors['accent_red'])
+        self.set_label_text(self.status_label, "🔴 已斷開", fg=self.colors['accent_red'])
         self.config_label.config(text="📝 正常模式", fg=self.colors['fg_secondary'])
         
         # 重置狀態變量
         self.is_config_mode = False
         
         # 清理數據緩衝區
-        self.raw_buffer.clear()
-        while not self.data_queue.empty():
-            try:
-                self.data_queue.get_nowait()
-            except:
-                break
+        self.clear_pending_data()
     
-    def parse_command_response(self, frame):
+    def parse_command_response(self, frame, timestamp=None):
         """解析命令回應幀 - 基於協議文檔實現"""
         if len(frame) < 8:  # 最小命令回應幀長度
             return
@@ -2640,10 +2845,10 @@ class DarkLD2412GUI:
         command_code = frame[6] | (frame[7] << 8)  # 命令碼（小端序）
         
         # 調試信息
-        frame_hex = ' '.join([f'{b:02X}' for b in frame])
-        print(f"解析命令回應: 長度={len(frame)}, 數據長度={data_length}")
-        print(f"完整幀: {frame_hex}")
-        print(f"命令碼: 0x{command_code:04X}")
+        frame_hex = frame.hex(' ').upper()
+        print(f"解析命令回應: 長度={len(frame)}, 數據長度={data_length}\n"
+              f"完整幀: {frame_hex}\n"
+              f"命令碼: 0x{command_code:04X}")
         
         # 檢查ACK狀態（前兩個字節通常是 00 00 表示成功）
         success = True
@@ -2651,7 +2856,8 @@ class DarkLD2412GUI:
             ack_status = frame[8] | (frame[9] << 8)
             success = (ack_status == 0x0000)
         
-        timestamp = datetime.now().strftime("%H:%M:%S.%f")[:-3]
+        if timestamp is None:
+            timestamp = self.get_timestamp()
         
         # 立即輸出基本回應信息到日誌
         self.log(f"📥 命令回應: 0x{command_code:04X}, 長度={len(frame)}, 數據長度={data_length}")
@@ -2675,7 +2881,7 @@ class DarkLD2412GUI:
                     self.log(f"{status_icon} 版本查詢{status_text}: {version_str}")
                     self.log(f"📋 完整版本號: {full_version}")
                 else:
-                    version_hex = ' '.join([f'{b:02X}' for b in version_data])
+                    version_hex = version_data.hex(' ').upper()
                     self.log(f"{status_icon} 版本查詢{status_text}: 原始數據={version_hex}")
             else:
                 self.log(f"{status_icon} 版本查詢{status_text}")
@@ -2697,7 +2903,7 @@ class DarkLD2412GUI:
                     self.log(f"  ⏱️ 無人持續時間: {timeout}秒")
                     self.log(f"  🔌 OUT腳極性: {out_desc}")
                 else:
-                    data_hex = ' '.join([f'{b:02X}' for b in param_data])
+                    data_hex = param_data.hex(' ').upper()
                     self.log(f"{status_icon} 參數查詢{status_text}: 原始數據={data_hex}")
             else:
                 self.log(f"{status_icon} 參數查詢{status_text}")
@@ -2745,7 +2951,7 @@ class DarkLD2412GUI:
                     resolution = resolution_map.get(resolution_code, f"未知分辨率 0x{resolution_code:02X}")
                     self.log(f"{status_icon} 距離分辨率查詢{status_text}: {resolution}")
                 else:
-                    data_hex = ' '.join([f'{b:02X}' for b in resolution_data])
+                    data_hex = resolution_data.hex(' ').upper()
                     self.log(f"{status_icon} 距離分辨率查詢{status_text}: 原始數據={data_hex}")
             else:
                 self.log(f"{status_icon} 距離分辨率查詢{status_text}")
@@ -2770,10 +2976,10 @@ class DarkLD2412GUI:
                 # 協議文檔：6字節MAC地址
                 mac_data = frame[10:]  # 跳過ACK狀態
                 if len(mac_data) >= 6:
-                    mac_str = ':'.join([f'{b:02X}' for b in mac_data[:6]])
+                    mac_str = mac_data[:6].hex(':').upper()
                     self.log(f"{status_icon} MAC查詢{status_text}: {mac_str}")
                 else:
-                    mac_hex = ' '.join([f'{b:02X}' for b in mac_data])
+                    mac_hex = mac_data.hex(' ').upper()
                     self.log(f"{status_icon} MAC查詢{status_text}: 原始數據={mac_hex}")
             else:
                 self.log(f"{status_icon} MAC查詢{status_text}")
@@ -2800,7 +3006,7 @@ class DarkLD2412GUI:
                 # 實際幀結構: 幀頭(4) + 長度(2) + 命令(2) + 狀態(1) + ACK狀態(1字節) + 門0敏感度(1字節) + 門1-13敏感度(13字節) + 幀尾(4)
                 
                 # 調試: 顯示完整幀信息
-                frame_hex = ' '.join([f'{b:02X}' for b in frame])
+                frame_hex = frame.hex(' ').upper()
                 self.log(f"🔍 完整幀: {frame_hex}")
                 
                 # 提取ACK狀態（位置8-9）
@@ -2854,7 +3060,7 @@ class DarkLD2412GUI:
                 # 實際幀結構: 幀頭(4) + 長度(2) + 命令(2) + 狀態(1) + ACK狀態(1字節) + 門0敏感度(1字節) + 門1-13敏感度(13字節) + 幀尾(4)
                 
                 # 調試: 顯示完整幀信息
-                frame_hex = ' '.join([f'{b:02X}' for b in frame])
+                frame_hex = frame.hex(' ').upper()
                 self.log(f"🔍 完整幀: {frame_hex}")
                 
                 # 提取ACK狀態（位置8-9）
@@ -2925,7 +3131,7 @@ class DarkLD2412GUI:
                     self.log(f"  💡 控制模式: {mode_text}")
                     self.log(f"  💡 光感閾值: {light_threshold} (0-255)")
                 else:
-                    data_hex = ' '.join([f'{b:02X}' for b in light_data])
+                    data_hex = light_data.hex(' ').upper()
                     self.log(f"{status_icon} 光感輔助控制查詢{status_text}: 原始數據={data_hex}")
             else:
                 self.log(f"{status_icon} 光感輔助控制查詢{status_text}")
@@ -2934,7 +3140,7 @@ class DarkLD2412GUI:
             # 通用回應顯示
             response_data = frame[8:] if len(frame) > 8 else []
             if response_data:
-                response_str = ' '.join([f'{b:02X}' for b in response_data])
+                response_str = response_data.hex(' ').upper()
                 self.log(f"{status_icon} 命令[0x{command_code:04X}]{status_text}: {response_str}")
             else:
                 self.log(f"{status_icon} 命令[0x{command_code:04X}]{status_text}")
@@ -2944,11 +3150,11 @@ class DarkLD2412GUI:
         if command_code in important_commands or not success:
             result = f"""[{timestamp}] 命令回應幀 - 命令碼: 0x{command_code:04X}
 幀長度: {len(frame)} 字節  數據長度: {data_length}  狀態: {status_text}
-原始幀: {' '.join([f'{b:02X}' for b in frame])}
-回應數據: {' '.join([f'{b:02X}' for b in frame[8:]]) if len(frame) > 8 else '無'}
+原始幀: {frame.hex(' ').upper()}
+回應數據: {frame[8:].hex(' ').upper() if len(frame) > 8 else '無'}
 {"="*50}
 """
-            self.add_text(self.detailed_text, result)
+            self.detailed_pending.append(result)
     
     # 組合功能函數
     def engineering_mode_init(self):
@@ -3336,6 +3542,10 @@ class DarkLD2412GUI:
         except KeyboardInterrupt:
             pass
         finally:
+            self.stop_event.set()
+            self.reader_wakeup.set()
+            self.raw_queue.put(None)
+            self.cancel_serial_read()
             if self.is_connected and self.serial_port:
                 self.serial_port.close()
 